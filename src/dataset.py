@@ -1,3 +1,4 @@
+import sys
 from src.utils import Result, check_file_integrity, normalize_color_string
 from src.file_extractor import initialize_card_data
 from typing import List, Dict, Tuple
@@ -47,6 +48,9 @@ class Dataset:
 
         if "card_ratings" in json_data:
             for card in json_data["card_ratings"].values():
+                # Card names are used as dict keys for every pick (ML ratings, overlay badges)
+                if isinstance(card.get(DATA_FIELD_NAME), str):
+                    card[DATA_FIELD_NAME] = sys.intern(card[DATA_FIELD_NAME])
                 if "deck_colors" in card:
                     card["deck_colors"] = {
                         normalize_color_string(k): v
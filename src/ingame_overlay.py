@@ -5,6 +5,7 @@ Each badge is an independent borderless tkinter Toplevel with click-through
 (WS_EX_LAYERED | WS_EX_TRANSPARENT) so the player can still interact with the game.
 """
 
+import functools
 import sys
 import tkinter
 from src import constants
@@ -16,6 +17,25 @@ logger = create_logger()
 GWL_EXSTYLE = -20
 WS_EX_LAYERED = 0x00080000
 WS_EX_TRANSPARENT = 0x00000020
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+# Window titles tried with FindWindowW, and substrings matched while enumerating
+MTGA_WINDOW_TITLES = ("MTGA", "Magic: The Gathering Arena")
+MTGA_TITLE_KEYWORDS = ("MTGA", "Magic")
+
+# Poll intervals (ms): fast while no move/resize hook is installed, slow
+# fallback once WinEvent notifications drive the repositioning.
+POLL_INTERVAL_MS = 500
+POLL_INTERVAL_HOOKED_MS = 5000
+# Without a hook, back off (doubling) to this interval after POLL_IDLE_TICKS
+# consecutive polls that found nothing to update
+POLL_INTERVAL_MAX_MS = 2000
+POLL_IDLE_TICKS = 4
 
 # Only import ctypes on Windows
 if sys.platform == "win32":
@@ -25,6 +45,28 @@ if sys.platform == "win32":
     user32 = ctypes.windll.user32
     shcore = ctypes.windll.shcore
 
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        ctypes.wintypes.HANDLE,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.HWND,
+        ctypes.wintypes.LONG,
+        ctypes.wintypes.LONG,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+    )
+    user32.SetWinEventHook.restype = ctypes.wintypes.HANDLE
+    user32.SetWinEventHook.argtypes = [
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.HMODULE,
+        WinEventProc,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+        ctypes.wintypes.DWORD,
+    ]
+    user32.UnhookWinEvent.argtypes = [ctypes.wintypes.HANDLE]
+
     # Enable per-monitor DPI awareness so positions match the actual screen
     try:
         shcore.SetProcessDpiAwareness(2)
@@ -40,6 +82,9 @@ GRID_LAYOUTS = {
     8: (8, 1), 7: (7, 1), 6: (6, 1),
     5: (5, 1), 4: (4, 1), 3: (3, 1), 2: (2, 1), 1: (1, 1),
 }
+MAX_PACK_SIZE = max(GRID_LAYOUTS)
+# Where badges are mapped once at startup, outside any monitor
+OFFSCREEN_GEOMETRY = "+-32000+-32000"
 
 # --- MTGA draft pack sort (reverse-engineered from CardSorter / SortTypeFilters.DraftPack) ---
 # Sort keys: MythicToCommon → LandLast → ColorOrder → Title
@@ -99,19 +144,36 @@ def _card_color_flags(card):
     return flag
 
 
+# Card dict field caching the MTGA sort key (set data is immutable during a draft)
+_SORT_KEY_FIELD = "_mtga_sort_key"
+
+
+def precompute_mtga_sort_key(card):
+    """Compute the MTGA DraftPack sort key for a card and cache it on the card dict."""
+    name = card.get(constants.DATA_FIELD_NAME, "")
+    # Unknown cards (name is numeric arena ID) are basic lands — sort last.
+    # Card names never start with a digit, so check the first character first.
+    if name[:1].isdigit() and name.isdigit():
+        key = (3, 1, 32, name)
+    else:
+        rarity = _RARITY_ORDER.get(card.get("rarity", "common"), 3)
+        is_land = 1 if "Land" in card.get("types", []) else 0
+        color_order = _COLOR_SORT_TABLE[_card_color_flags(card) & 0x1F]
+        key = (rarity, is_land, color_order, name)
+    card[_SORT_KEY_FIELD] = key
+    return key
+
+
 def mtga_draft_sort_key(card):
     """Return a sort key tuple matching MTGA's DraftPack sort order."""
-    name = card.get(constants.DATA_FIELD_NAME, "")
-    # Unknown cards (name is numeric arena ID) are basic lands — sort last
-    if name.isdigit():
-        return (3, 1, 32, name)
-    rarity = _RARITY_ORDER.get(card.get("rarity", "common"), 3)
-    is_land = 1 if "Land" in card.get("types", []) else 0
-    color_order = _COLOR_SORT_TABLE[_card_color_flags(card) & 0x1F]
-    return (rarity, is_land, color_order, name)
+    key = card.get(_SORT_KEY_FIELD)
+    if key is None:
+        key = precompute_mtga_sort_key(card)
+    return key
 
 
 # --- Color tiers ---
+@functools.lru_cache(maxsize=2048)
 def _tier_colors(rating, is_best):
     """Return (background, foreground) for a given rating value."""
     if is_best:
@@ -152,21 +214,46 @@ class RatingBadge:
         self.label.pack()
 
         self._visible = False
-        self._click_through_set = False
+        self._click_through_set = sys.platform != "win32"  # only needed on Windows
+        self._last_state = None  # (text, bg, fg, x, y) last applied by show()
 
     def _ensure_click_through(self):
-        """Apply WS_EX_LAYERED | WS_EX_TRANSPARENT so clicks pass through."""
-        if self._click_through_set or sys.platform != "win32":
+        """Apply WS_EX_LAYERED | WS_EX_TRANSPARENT so clicks pass through.
+
+        Must run after the badge has been mapped: Tk only creates the wrapper
+        frame window on first map, and before that wm_frame() falls back to
+        the client window, which would receive the style instead.
+        """
+        if self._click_through_set:
             return
         try:
             self.top.update_idletasks()
-            hwnd = int(self.top.wm_frame(), 16) if self.top.wm_frame() else self.top.winfo_id()
+        except Exception as e:
+            logger.error("Failed to set click-through: %s", e)
+            return
+        self._apply_click_through()
+
+    def _apply_click_through(self):
+        """Set the click-through style without flushing Tk's idle queue."""
+        if self._click_through_set:
+            return
+        try:
+            frame = self.top.wm_frame()
+            hwnd = int(frame, 16) if frame else self.top.winfo_id()
+            if hwnd == self.top.winfo_id():
+                # Wrapper frame not created yet - retry on the next show()
+                return
             style = user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
             user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style | WS_EX_LAYERED | WS_EX_TRANSPARENT)
             self._click_through_set = True
         except Exception as e:
             logger.error("Failed to set click-through: %s", e)
 
+    def map_offscreen(self):
+        """Map the badge far off-screen so Tk creates its wrapper frame."""
+        self.top.geometry(OFFSCREEN_GEOMETRY)
+        self.top.deiconify()
+
     def show(self, x, y, rating, is_best=False, debug_info=None):
         """Position the badge at (x, y) screen coords and display the rating."""
         bg, fg = _tier_colors(rating, is_best)
@@ -176,9 +263,17 @@ class RatingBadge:
             short_name = name[:10] if len(name) > 10 else name
             text = f"{text} [{idx}:{short_name}]"
 
-        self.label.config(text=text, bg=bg, fg=fg)
-        self.top.config(bg=bg)
-        self.top.geometry(f"+{x}+{y}")
+        # Only issue the Tk calls for what actually changed
+        state = (text, bg, fg, x, y)
+        last = self._last_state
+        if self._visible and state == last and self._click_through_set:
+            return
+        if last is None or last[:3] != state[:3]:
+            self.label.config(text=text, bg=bg, fg=fg)
+            self.top.config(bg=bg)
+        if last is None or last[3:] != state[3:]:
+            self.top.geometry(f"+{x}+{y}")
+        self._last_state = state
 
         if not self._visible:
             self.top.deiconify()
@@ -204,51 +299,193 @@ class InGameOverlay:
     def __init__(self, root, configuration):
         self.root = root
         self.configuration = configuration
-        self._badges = []  # list of RatingBadge
+        self._badges = []  # list of RatingBadge, one per card slot
         self._poll_id = None
+        self._poll_interval = POLL_INTERVAL_MS
+        self._idle_ticks = 0
+        self._mtga_hwnd = None
+        self._win_event_hook = None  # move/resize hook
+        self._win_event_close_hook = None  # destroy/show/hide hook
+        self._win_event_proc = None  # keep the ctypes callback alive
+        self._reposition_pending = False
         self._last_mtga_rect = None
         self._last_pack_cards = []
+        self._sorted_pack_cards = []  # _last_pack_cards in MTGA display order
         self._last_ratings = {}
         self._last_pick_number = -1
+        # (rect, pick_number, ratings, sorted pack, debug) of the badges on screen
+        self._last_applied_state = None
+        # (sorted pack, ratings) -> ([(name, rating), ...], best_rating)
+        self._cached_rating_inputs = None
+        self._cached_card_ratings = []
+        self._cached_best_rating = 0
+
+        self._create_badges()
 
         # Start the MTGA-tracking poll loop
         self._start_polling()
 
+    def _create_badges(self):
+        """Create a (withdrawn) badge for every card slot up front.
+
+        Each badge is mapped off-screen once so Tk creates its wrapper frame,
+        click-through is applied after a single idle flush, and the badges
+        are withdrawn again.  The first show() is then only a config and
+        geometry call.
+        """
+        if sys.platform != "win32":
+            return
+        self._badges = [RatingBadge(self.root) for _ in range(MAX_PACK_SIZE)]
+        try:
+            for badge in self._badges:
+                badge.map_offscreen()
+            self.root.update_idletasks()
+            for badge in self._badges:
+                badge._apply_click_through()
+        except Exception as e:
+            logger.error("Failed to prepare rating badges: %s", e)
+        finally:
+            for badge in self._badges:
+                badge.top.withdraw()
+
     # ------------------------------------------------------------------
     # MTGA window detection (Win32)
     # ------------------------------------------------------------------
 
     def _find_mtga_window(self):
-        """Return HWND of the MTGA window, or None."""
+        """Return HWND of the MTGA window, or None.
+
+        The handle is cached and revalidated on each call; the full window
+        enumeration only runs when the cached handle is gone or hidden.
+        """
         if sys.platform != "win32":
             return None
         try:
+            hwnd = self._mtga_hwnd
+            if hwnd and user32.IsWindow(hwnd) and user32.IsWindowVisible(hwnd):
+                return hwnd
+            self._mtga_hwnd = None
+            self._remove_location_hook()
+
             # Try known window titles
-            for title in ("MTGA", "Magic: The Gathering Arena"):
+            for title in MTGA_WINDOW_TITLES:
                 hwnd = user32.FindWindowW(None, title)
-                if hwnd and hwnd != 0:
+                if hwnd and hwnd != 0 and user32.IsWindowVisible(hwnd):
+                    self._mtga_hwnd = hwnd
+                    self._install_location_hook(hwnd)
                     return hwnd
             # Enumerate windows to find one containing "Magic" or "MTGA"
             found_hwnd = None
+            buf = ctypes.create_unicode_buffer(256)  # shared by every callback
             @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
             def enum_callback(h, _):
                 nonlocal found_hwnd
-                buf = ctypes.create_unicode_buffer(256)
+                # Cheapest filters first: invisible and untitled windows
+                if not user32.IsWindowVisible(h):
+                    return True
+                if user32.GetWindowTextLengthW(h) == 0:
+                    return True
                 user32.GetWindowTextW(h, buf, 256)
                 title = buf.value
-                if title and ("MTGA" in title or "Magic" in title):
+                if any(keyword in title for keyword in MTGA_TITLE_KEYWORDS):
                     logger.info("Found candidate MTGA window: '%s' (hwnd=%s)", title, h)
-                    if user32.IsWindowVisible(h):
-                        found_hwnd = h
-                        return False  # stop enumeration
+                    found_hwnd = h
+                    return False  # stop enumeration
                 return True
             user32.EnumWindows(enum_callback, 0)
             if found_hwnd:
+                self._mtga_hwnd = found_hwnd
+                self._install_location_hook(found_hwnd)
                 return found_hwnd
         except Exception as e:
             logger.error("Error finding MTGA window: %s", e)
         return None
 
+    def _install_location_hook(self, hwnd):
+        """Subscribe to move/resize and close/hide events of the MTGA window.
+
+        Two narrow hooks are used instead of one covering the whole
+        0x8001-0x800B range, which would also deliver every focus, selection
+        and state change of the MTGA process.
+        """
+        self._remove_location_hook()
+        try:
+            pid = ctypes.wintypes.DWORD()
+            tid = user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            proc = WinEventProc(self._on_win_event)
+            self._win_event_proc = proc
+            for event_min, event_max, attr in (
+                (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE, "_win_event_hook"),
+                (EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE, "_win_event_close_hook"),
+            ):
+                hook = user32.SetWinEventHook(
+                    event_min,
+                    event_max,
+                    None,
+                    proc,
+                    pid.value,
+                    tid,
+                    WINEVENT_OUTOFCONTEXT,
+                )
+                if hook:
+                    setattr(self, attr, hook)
+                else:
+                    logger.error("SetWinEventHook failed for hwnd=%s", hwnd)
+        except Exception as e:
+            logger.error("Failed to install MTGA move hook: %s", e)
+
+    def _remove_location_hook(self):
+        for hook in (self._win_event_hook, self._win_event_close_hook):
+            if hook is not None:
+                try:
+                    user32.UnhookWinEvent(hook)
+                except Exception:
+                    pass
+        self._win_event_hook = None
+        self._win_event_close_hook = None
+        self._win_event_proc = None
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """WinEvent callback: reposition on move/resize, hide on close/hide."""
+        if (
+            hwnd != self._mtga_hwnd
+            or id_object != OBJID_WINDOW
+            or id_child != CHILDID_SELF
+        ):
+            return
+        if event != EVENT_OBJECT_LOCATIONCHANGE:
+            if event in (EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE):
+                try:
+                    self.root.after(0, self._on_mtga_closed)
+                except Exception:
+                    pass
+            return
+        # A drag produces a burst of events; coalesce them into one reposition
+        if self._reposition_pending:
+            return
+        try:
+            self._reposition_pending = True
+            self.root.after(0, self._on_mtga_moved)
+        except Exception:
+            self._reposition_pending = False
+
+    def _on_mtga_closed(self):
+        """MTGA was closed or hidden: hide the badges and go back to fast polling."""
+        self._mtga_hwnd = None
+        self._remove_location_hook()
+        self._hide_all()
+        self._reset_poll_interval()
+        self._stop_polling()
+        self._poll_id = self.root.after(POLL_INTERVAL_MS, self._poll_tick)
+
+    def _on_mtga_moved(self):
+        self._reposition_pending = False
+        self._reset_poll_interval()
+        try:
+            self._reposition_if_active()
+        except Exception as e:
+            logger.error("Overlay reposition error: %s", e)
+
     def _get_mtga_rect(self, hwnd):
         """Return (left, top, right, bottom) client rect in screen coords."""
         try:
@@ -278,7 +515,7 @@ class InGameOverlay:
         The positions are derived from the MTGA client rect and calibration
         parameters stored in configuration.features.
         """
-        if num_cards <= 0 or num_cards > 15:
+        if num_cards <= 0 or num_cards > MAX_PACK_SIZE:
             return []
 
         left, top, right, bottom = window_rect
@@ -343,15 +580,23 @@ class InGameOverlay:
         if sys.platform != "win32":
             return
 
+        # Sort once per pack; polls and move events reuse the cached order
+        if pick_number != self._last_pick_number or pack_cards != self._last_pack_cards:
+            self._sorted_pack_cards = sorted(pack_cards, key=mtga_draft_sort_key) if pack_cards else []
         self._last_pack_cards = pack_cards
         self._last_ratings = ratings_dict
         self._last_pick_number = pick_number
 
+        self._reset_poll_interval()
         self._position_badges()
 
     def _position_badges(self):
-        """Internal: position badges using current cached state."""
-        pack_cards = sorted(self._last_pack_cards, key=mtga_draft_sort_key) if self._last_pack_cards else []
+        """Internal: position badges using current cached state.
+
+        Returns True if badges were (re)drawn, False if they were hidden or
+        already up to date.
+        """
+        pack_cards = self._sorted_pack_cards
         ratings_dict = self._last_ratings
 
         if not pack_cards or not ratings_dict:
@@ -359,43 +604,45 @@ class InGameOverlay:
                          len(pack_cards) if pack_cards else 0,
                          len(ratings_dict) if ratings_dict else 0)
             self._hide_all()
-            return
+            return False
 
         hwnd = self._find_mtga_window()
         if hwnd is None:
             logger.debug("MTGA window not found, hiding badges")
             self._hide_all()
-            return
+            return False
         if self._is_minimized(hwnd):
             self._hide_all()
-            return
+            return False
 
         rect = self._get_mtga_rect(hwnd)
         if rect is None:
             self._hide_all()
-            return
+            return False
 
         self._last_mtga_rect = rect
+        debug_mode = getattr(self.configuration.features, "ingame_overlay_debug", False)
+
+        # Steady state: same window rect, same pack and same ratings
+        last = self._last_applied_state
+        if (
+            last is not None
+            and last[0] == rect
+            and last[1] == self._last_pick_number
+            and last[2] is ratings_dict
+            and last[3] is pack_cards
+            and last[4] == debug_mode
+        ):
+            return False
+
         num_cards = len(pack_cards)
         positions = self._calculate_card_positions(num_cards, rect)
 
         if len(positions) != num_cards:
             self._hide_all()
-            return
-
-        # Ensure we have enough badge objects
-        while len(self._badges) < num_cards:
-            self._badges.append(RatingBadge(self.root))
-
-        # Determine which card has the best rating
-        card_ratings = []
-        for card in pack_cards:
-            name = card.get(constants.DATA_FIELD_NAME, "") if isinstance(card, dict) else str(card)
-            r = ratings_dict.get(name, 0.0)
-            card_ratings.append((name, r))
+            return False
 
-        best_rating = max((r for _, r in card_ratings), default=0)
-        debug_mode = getattr(self.configuration.features, "ingame_overlay_debug", False)
+        card_ratings, best_rating = self._get_card_ratings(pack_cards, ratings_dict)
 
         for idx, (pos, (name, rating)) in enumerate(zip(positions, card_ratings)):
             is_best = (rating == best_rating and rating > 0)
@@ -408,25 +655,59 @@ class InGameOverlay:
         for idx in range(num_cards, len(self._badges)):
             self._badges[idx].hide()
 
+        self._last_applied_state = (rect, self._last_pick_number, ratings_dict, pack_cards, debug_mode)
+        return True
+
+    def _get_card_ratings(self, pack_cards, ratings_dict):
+        """Return ([(name, rating), ...], best_rating) for the pack.
+
+        Cached until a different pack list or ratings dict is passed in, so
+        window moves only recompute badge positions.
+        """
+        cached = self._cached_rating_inputs
+        if cached is not None and cached[0] is pack_cards and cached[1] is ratings_dict:
+            return self._cached_card_ratings, self._cached_best_rating
+
+        card_ratings = []
+        for card in pack_cards:
+            name = card.get(constants.DATA_FIELD_NAME, "") if isinstance(card, dict) else str(card)
+            r = ratings_dict.get(name, 0.0)
+            card_ratings.append((name, r))
+
+        # Determine which card has the best rating
+        best_rating = max((r for _, r in card_ratings), default=0)
+
+        self._cached_rating_inputs = (pack_cards, ratings_dict)
+        self._cached_card_ratings = card_ratings
+        self._cached_best_rating = best_rating
+        return card_ratings, best_rating
+
     def hide_all(self):
         """Public method to hide all badges and clear cached state."""
         self._last_pack_cards = []
+        self._sorted_pack_cards = []
         self._last_ratings = {}
+        self._cached_rating_inputs = None
         self._hide_all()
 
     def _hide_all(self):
+        self._last_applied_state = None
         for badge in self._badges:
             badge.hide()
 
     def destroy(self):
         """Destroy all badge windows and stop polling."""
         self._stop_polling()
+        if sys.platform == "win32":
+            self._remove_location_hook()
         for badge in self._badges:
             badge.destroy()
         self._badges.clear()
 
     # ------------------------------------------------------------------
-    # Polling loop: reposition badges when MTGA moves / resizes
+    # Polling loop: reposition badges when MTGA moves / resizes.
+    # Once a WinEvent hook is installed, moves are handled by _on_win_event
+    # and the poll only serves as a slow fallback (window re-creation etc.).
     # ------------------------------------------------------------------
 
     def _start_polling(self):
@@ -440,19 +721,38 @@ class InGameOverlay:
                 pass
             self._poll_id = None
 
+    def _reset_poll_interval(self):
+        self._poll_interval = POLL_INTERVAL_MS
+        self._idle_ticks = 0
+
+    def _reposition_if_active(self):
+        """Reposition badges if a pack is displayed; return True if anything changed."""
+        if (
+            self.configuration.settings.ingame_overlay_enabled
+            and self._last_pack_cards
+            and self._last_ratings
+        ):
+            return self._position_badges()
+        return False
+
     def _poll_tick(self):
-        """Re-check MTGA window position every 500ms."""
+        """Re-check MTGA window position (500ms-2s, or 5s while hooked)."""
+        changed = False
         try:
-            if (
-                self.configuration.settings.ingame_overlay_enabled
-                and self._last_pack_cards
-                and self._last_ratings
-            ):
-                self._position_badges()
+            changed = self._reposition_if_active()
         except Exception as e:
             logger.error("Overlay poll error: %s", e)
 
+        if changed:
+            self._reset_poll_interval()
+        else:
+            self._idle_ticks += 1
+            if self._idle_ticks >= POLL_IDLE_TICKS:
+                self._poll_interval = min(self._poll_interval * 2, POLL_INTERVAL_MAX_MS)
+                self._idle_ticks = 0
+
+        interval = POLL_INTERVAL_HOOKED_MS if self._win_event_hook else self._poll_interval
         try:
-            self._poll_id = self.root.after(500, self._poll_tick)
+            self._poll_id = self.root.after(interval, self._poll_tick)
         except Exception:
             pass
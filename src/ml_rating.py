@@ -1,24 +1,86 @@
 """ML Rating module - Uses ONNX models to calculate synergy-based card ratings"""
 
+import csv
 import os
 import sys
 import logging
-from typing import Dict, List, Optional
+import importlib.util
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, List, Optional
+
 import numpy as np
-import pandas as pd
 
-try:
+if TYPE_CHECKING:
     import onnxruntime as ort
-    ONNX_AVAILABLE = True
-except ImportError:
-    ONNX_AVAILABLE = False
+
+# onnxruntime is imported on first use to keep application start-up fast
+ONNX_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
+_ort = None
+_ort_import_failed = False
+
+# Subdirectory of the model directory holding ORT-optimized copies of the models
+OPTIMIZED_MODEL_SUBDIR = "onnx_opt"
 
 logger = logging.getLogger(__name__)
 
 
+def _import_onnxruntime():
+    """Import onnxruntime on first use; returns None if the import fails.
+
+    A failed import (e.g. a missing DLL) is remembered so it is only attempted
+    and logged once.
+    """
+    global _ort, _ort_import_failed
+    if _ort is None and not _ort_import_failed:
+        try:
+            import onnxruntime
+            _ort = onnxruntime
+        except Exception as e:
+            _ort_import_failed = True
+            logger.error(f"Failed to import onnxruntime: {e}")
+    return _ort
+
+
 def is_ml_rating_available() -> bool:
     """Check if ONNX runtime is available for ML rating calculations"""
-    return ONNX_AVAILABLE
+    return ONNX_AVAILABLE and _import_onnxruntime() is not None
+
+
+def _create_session_options() -> "ort.SessionOptions":
+    """Session options tuned for latency of a single small inference per pick.
+
+    A thread pool costs more in dispatch than it saves for these models, so
+    the session runs sequentially on the calling thread.
+    """
+    ort = _import_onnxruntime()
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = 1
+    options.inter_op_num_threads = 1
+    options.enable_mem_pattern = True
+    return options
+
+
+def normalize_scores(scores: "np.ndarray") -> "np.ndarray":
+    """Map raw model scores to the 0-100 rating scale, in place.
+
+    Applies 100 / (1 + exp(-1.2 * (raw - mean) / std)), the same formula as
+    draftassistant.py, and returns the same array.
+    """
+    mean = scores.mean()
+    std = scores.std()
+    if std > 0:
+        scores -= mean
+        scores *= -1.2 / std
+        np.exp(scores, out=scores)
+        scores += 1.0
+        np.reciprocal(scores, out=scores)
+        scores *= 100.0
+    else:
+        scores.fill(50.0)
+    return scores
 
 
 def _find_appdata_model_directory() -> str:
@@ -63,18 +125,20 @@ class MLModelManager:
 
     def __init__(self, model_directory: str = ""):
         self.model_directory = model_directory or find_best_model_directory()
-        self._sessions: Dict[str, ort.InferenceSession] = {} if ONNX_AVAILABLE else {}
+        self._sessions: Dict[str, "ort.InferenceSession"] = {}
         self._cardnames: Dict[str, List[str]] = {}
+        self._name_to_idx: Dict[str, Dict[str, int]] = {}
 
     def set_model_directory(self, path: str):
         """Set the model directory and clear cached models"""
         self.model_directory = path
         self._sessions.clear()
         self._cardnames.clear()
+        self._name_to_idx.clear()
 
     def get_model(self, set_code: str, mode: str = "Premier") -> Optional["ort.InferenceSession"]:
         """Load or retrieve cached ONNX model for a set/mode combination"""
-        if not ONNX_AVAILABLE:
+        if not is_ml_rating_available():
             return None
 
         cache_key = f"{set_code}_{mode}"
@@ -85,10 +149,13 @@ class MLModelManager:
         modes_to_try = [mode, "PickTwo"] if mode == "Premier" else [mode]
 
         for try_mode in modes_to_try:
-            model_path = os.path.join(self.model_directory, "onnx", f"{set_code}_{try_mode}.onnx")
+            # Prefer the INT8 quantized model when one is shipped
+            model_path = os.path.join(self.model_directory, "onnx", f"{set_code}_{try_mode}_int8.onnx")
+            if not os.path.exists(model_path):
+                model_path = os.path.join(self.model_directory, "onnx", f"{set_code}_{try_mode}.onnx")
             if os.path.exists(model_path):
                 try:
-                    session = ort.InferenceSession(model_path)
+                    session = self._load_session(model_path)
                     self._sessions[cache_key] = session
                     logger.info(f"Loaded ML model: {model_path}")
                     return session
@@ -99,6 +166,57 @@ class MLModelManager:
         logger.warning(f"No ML model found for {set_code}")
         return None
 
+    def _load_session(self, model_path: str) -> "ort.InferenceSession":
+        """Create an inference session, reusing a previously optimized graph.
+
+        The first load saves ORT's optimized graph to onnx_opt/ (when the model
+        directory is writable); later loads open that copy with graph
+        optimization disabled. The cached file name records the source model's
+        size and mtime, so any replaced model gets a fresh optimized copy.
+        """
+        ort = _import_onnxruntime()
+        providers = ["CPUExecutionProvider"]
+        opt_dir = os.path.join(self.model_directory, OPTIMIZED_MODEL_SUBDIR)
+        model_name = os.path.splitext(os.path.basename(model_path))[0]
+        model_stat = os.stat(model_path)
+        opt_prefix = f"{model_name}."
+        opt_name = f"{opt_prefix}{model_stat.st_size}_{model_stat.st_mtime_ns}.opt.onnx"
+        opt_path = os.path.join(opt_dir, opt_name)
+
+        if os.path.exists(opt_path):
+            options = _create_session_options()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            try:
+                return ort.InferenceSession(opt_path, sess_options=options, providers=providers)
+            except Exception as e:
+                logger.warning(f"Failed to load optimized model {opt_path}: {e}")
+
+        options = _create_session_options()
+        try:
+            os.makedirs(opt_dir, exist_ok=True)
+            if os.access(opt_dir, os.W_OK):
+                # Drop optimized copies of earlier versions of this model
+                for f in os.listdir(opt_dir):
+                    if f.startswith(opt_prefix) and f.endswith(".opt.onnx") and f != opt_name:
+                        os.remove(os.path.join(opt_dir, f))
+                # ENABLE_ALL adds hardware-specific layout transforms that ORT
+                # does not persist cleanly; save the portable EXTENDED graph
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+                options.optimized_model_filepath = opt_path
+        except OSError:
+            pass
+
+        try:
+            return ort.InferenceSession(model_path, sess_options=options, providers=providers)
+        except Exception as e:
+            if not options.optimized_model_filepath:
+                raise
+            # Saving the optimized graph failed - load without persisting it
+            logger.warning(f"Failed to save optimized model {opt_path}: {e}")
+            return ort.InferenceSession(
+                model_path, sess_options=_create_session_options(), providers=providers
+            )
+
     def get_cardnames(self, set_code: str) -> Optional[List[str]]:
         """Load card names list from CSV for a set"""
         if set_code in self._cardnames:
@@ -110,15 +228,27 @@ class MLModelManager:
             return None
 
         try:
-            df = pd.read_csv(csv_path)
-            cardnames = df["name"].tolist()
+            # Interned so lookups with names from the set data hit on identity
+            with open(csv_path, "r", encoding="utf-8-sig", newline="") as csv_file:
+                cardnames = [sys.intern(row["name"]) for row in csv.DictReader(csv_file)]
             self._cardnames[set_code] = cardnames
+            # Keep the first occurrence of a name, matching list.index()
+            name_to_idx: Dict[str, int] = {}
+            for i, name in enumerate(cardnames):
+                name_to_idx.setdefault(name, i)
+            self._name_to_idx[set_code] = name_to_idx
             logger.info(f"Loaded {len(cardnames)} card names for {set_code}")
             return cardnames
         except Exception as e:
             logger.error(f"Failed to load card CSV {csv_path}: {e}")
             return None
 
+    def get_name_to_index(self, set_code: str) -> Optional[Dict[str, int]]:
+        """Return the {card_name: column index} map for a set's card list"""
+        if self.get_cardnames(set_code) is None:
+            return None
+        return self._name_to_idx[set_code]
+
 
 class MLRatingCalculator:
     """Calculates ML-based card ratings using ONNX models"""
@@ -128,6 +258,61 @@ class MLRatingCalculator:
         self._current_ratings: Dict[str, float] = {}
         self._current_set: str = ""
         self._current_mode: str = ""
+        # Model input buffers, reused across picks for the same card list
+        self._buffer_cardnames: Optional[List[str]] = None
+        self._collection_buf: Optional["np.ndarray"] = None
+        self._pack_buf: Optional["np.ndarray"] = None
+        self._last_pool: Counter = Counter()
+        # IOBinding over the input buffers for the current session
+        self._io_session = None
+        self._io_binding = None
+        self._io_inputs: List["ort.OrtValue"] = []
+
+    def _update_input_buffers(self, cardnames: List[str], name_to_idx: Dict[str, int], pool_names: List[str]):
+        """Return the (collection, pack) input buffers updated for the given pool.
+
+        Consecutive picks usually differ by a single card, so only the entries
+        whose pool count changed are rewritten.
+        """
+        if self._buffer_cardnames is not cardnames:
+            self._collection_buf = np.zeros((1, len(cardnames)), dtype=np.float32)
+            # Pack vector is all ones - consider all cards
+            self._pack_buf = np.ones((1, len(cardnames)), dtype=np.float32)
+            self._buffer_cardnames = cardnames
+            self._last_pool = Counter()
+            self._io_session = None
+
+        pool = Counter(name for name in pool_names if name in name_to_idx)
+        collection = self._collection_buf[0]
+        for name in pool.keys() | self._last_pool.keys():
+            count = pool[name]
+            if count != self._last_pool[name]:
+                collection[name_to_idx[name]] = count
+        self._last_pool = pool
+
+        return self._collection_buf, self._pack_buf
+
+    def _get_io_binding(self, session: "ort.InferenceSession") -> "ort.IOBinding":
+        """Return an IOBinding of the input buffers to the session.
+
+        The OrtValues share memory with the numpy buffers, so updating the
+        buffers in place is enough before each run_with_iobinding call.
+        """
+        if self._io_session is not session:
+            ort = _import_onnxruntime()
+            input_names = [inp.name for inp in session.get_inputs()]
+            output_name = session.get_outputs()[0].name
+            self._io_inputs = [
+                ort.OrtValue.ortvalue_from_numpy(self._collection_buf),
+                ort.OrtValue.ortvalue_from_numpy(self._pack_buf),
+            ]
+            io_binding = session.io_binding()
+            io_binding.bind_ortvalue_input(input_names[0], self._io_inputs[0])
+            io_binding.bind_ortvalue_input(input_names[1], self._io_inputs[1])
+            io_binding.bind_output(output_name, "cpu")
+            self._io_binding = io_binding
+            self._io_session = session
+        return self._io_binding
 
     def compute_ratings(self, pool_names: List[str], set_code: str, mode: str = "Premier") -> Dict[str, float]:
         """
@@ -141,7 +326,7 @@ class MLRatingCalculator:
         Returns:
             Dictionary mapping card names to ratings (0-100 scale)
         """
-        if not ONNX_AVAILABLE:
+        if not is_ml_rating_available():
             return {}
 
         session = self.model_manager.get_model(set_code, mode)
@@ -151,41 +336,23 @@ class MLRatingCalculator:
         cardnames = self.model_manager.get_cardnames(set_code)
         if cardnames is None:
             return {}
+        name_to_idx = self.model_manager.get_name_to_index(set_code)
 
         try:
-            # Build collection vector from pool
-            collection_vector = np.zeros((1, len(cardnames)), dtype=np.float32)
-            for name in pool_names:
-                if name in cardnames:
-                    idx = cardnames.index(name)
-                    collection_vector[0, idx] += 1
-
-            # Create pack vector (all ones - consider all cards)
-            pack_vector = np.ones((1, len(cardnames)), dtype=np.float32)
+            # Collection vector holds pool card counts; pack vector is all ones
+            self._update_input_buffers(cardnames, name_to_idx, pool_names)
 
             # Run ONNX inference
-            input_names = [inp.name for inp in session.get_inputs()]
-            outputs = session.run(None, {
-                input_names[0]: collection_vector,
-                input_names[1]: pack_vector
-            })
-
-            # Get raw scores
-            raw_scores = outputs[0].flatten()
-
-            # Apply sigmoid normalization to 0-100 scale
-            # Same formula as draftassistant.py
-            mean = np.mean(raw_scores)
-            std = np.std(raw_scores)
-            if std > 0:
-                ratings = 100 / (1 + np.exp(-1.2 * (raw_scores - mean) / std))
-            else:
-                ratings = np.full_like(raw_scores, 50.0)
+            io_binding = self._get_io_binding(session)
+            session.run_with_iobinding(io_binding)
+
+            # Get raw scores (flatten() returns a copy we can normalize in place)
+            ratings = normalize_scores(io_binding.get_outputs()[0].numpy().flatten())
 
             # Build result dictionary
             self._current_ratings = {
-                name: round(float(ratings[i]), 1)
-                for i, name in enumerate(cardnames)
+                name: round(rating, 1)
+                for name, rating in zip(cardnames, ratings.tolist())
             }
             self._current_set = set_code
             self._current_mode = mode
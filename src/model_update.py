@@ -1,13 +1,16 @@
 """Model update module - checks for and downloads ML model updates from GitHub Releases."""
 
+import io
 import json
 import os
 import shutil
 import ssl
 import sys
 import tempfile
+import urllib.error
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from src.logger import create_logger
 
 logger = create_logger()
@@ -16,6 +19,57 @@ MODELS_RELEASE_URL = (
     "https://api.github.com/repos/im20a/statistical-drafting/releases/latest"
 )
 
+# Last release response (ETag, tag, asset URL), kept in the models directory
+RELEASE_CACHE_FILE = "release_etag.json"
+
+# Bundles larger than this are spooled to a temp file instead of memory
+MODELS_IN_MEMORY_LIMIT = 200 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _extract_members(archive, names, target_dir):
+    """Extract the named members using a ZipFile handle private to this call."""
+    if isinstance(archive, bytes):
+        archive = io.BytesIO(archive)
+    with zipfile.ZipFile(archive, "r") as zf:
+        for name in names:
+            zf.extract(name, target_dir)
+
+
+def extract_zip_parallel(archive, target_dir):
+    """Extract a ZIP archive, decompressing members on a thread pool.
+
+    Args:
+        archive: Path to the ZIP file, or its contents as bytes.
+        target_dir: Directory to extract into.
+    """
+    if isinstance(archive, bytes):
+        source = io.BytesIO(archive)
+    else:
+        source = archive
+    with zipfile.ZipFile(source, "r") as zf:
+        members = sorted(zf.infolist(), key=lambda info: info.file_size, reverse=True)
+
+    # Create member directories up front so workers don't race on makedirs
+    real_target = os.path.realpath(target_dir)
+    for info in members:
+        parent = os.path.realpath(os.path.join(target_dir, os.path.dirname(info.filename)))
+        if os.path.commonpath([real_target, parent]) == real_target:
+            os.makedirs(parent, exist_ok=True)
+
+    # Each worker opens its own ZipFile, so no file position is shared
+    workers = max(1, min(os.cpu_count() or 1, len(members)))
+    partitions = [
+        [info.filename for info in members[i::workers]] for i in range(workers)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_members, archive, names, target_dir)
+            for names in partitions
+        ]
+        for future in futures:
+            future.result()
+
 
 def get_appdata_models_dir() -> str:
     """Return the platform-specific AppData directory for downloaded models."""
@@ -50,21 +104,44 @@ class ModelUpdate:
             Tuple of (new_tag, download_url) if an update is available, otherwise None.
         """
         try:
+            cache = self._read_release_cache()
             req = urllib.request.Request(
                 MODELS_RELEASE_URL,
                 headers={"Accept": "application/vnd.github.v3+json"},
             )
-            response = urllib.request.urlopen(req, context=self.context)
+            if cache.get("etag"):
+                req.add_header("If-None-Match", cache["etag"])
+
+            try:
+                response = urllib.request.urlopen(req, context=self.context)
+            except urllib.error.HTTPError as error:
+                if error.code != 304:
+                    raise
+                # Release unchanged since the last check - reuse its details
+                tag = cache.get("tag", "")
+                download_url = cache.get("download_url", "")
+                if not tag or tag == current_tag or not download_url:
+                    return None
+                return tag, download_url
+
             release = json.loads(response.read())
 
             tag = release.get("tag_name", "")
-            if not tag or tag == current_tag:
-                return None
 
             # Find the models.zip asset
+            download_url = ""
             for asset in release.get("assets", []):
                 if asset["name"].endswith(".zip"):
-                    return tag, asset["browser_download_url"]
+                    download_url = asset["browser_download_url"]
+                    break
+
+            self._write_release_cache(response.headers.get("ETag", ""), tag, download_url)
+
+            if not tag or tag == current_tag:
+                return None
+
+            if download_url:
+                return tag, download_url
 
             logger.warning("Model release %s has no ZIP asset", tag)
             return None
@@ -73,6 +150,29 @@ class ModelUpdate:
             logger.error("Failed to check for model updates: %s", error)
             return None
 
+    def _read_release_cache(self) -> dict:
+        """Return the cached release details from the last check, or {}."""
+        try:
+            cache_path = os.path.join(get_appdata_models_dir(), RELEASE_CACHE_FILE)
+            with open(cache_path, "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_release_cache(self, etag: str, tag: str, download_url: str):
+        """Store the release ETag so the next check can be a conditional request."""
+        try:
+            cache_path = os.path.join(get_appdata_models_dir(), RELEASE_CACHE_FILE)
+            if not etag:
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                return
+            with open(cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"etag": etag, "tag": tag, "download_url": download_url}, cache_file)
+        except OSError as error:
+            logger.error("Failed to write model release cache: %s", error)
+
     def download_and_install(self, download_url: str) -> bool:
         """Download a model ZIP and extract it to the AppData models directory.
 
@@ -82,25 +182,32 @@ class ModelUpdate:
         Returns:
             True if successful, False otherwise.
         """
+        tmp_path = None
         try:
             models_dir = get_appdata_models_dir()
 
-            # Download to a temp file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-                tmp_path = tmp.name
-                logger.info("Downloading models from %s", download_url)
-                with urllib.request.urlopen(download_url, context=self.context) as resp:
-                    shutil.copyfileobj(resp, tmp)
-
-            # Clear existing downloaded models before extracting
-            for subdir in ("onnx", "cards"):
+            logger.info("Downloading models from %s", download_url)
+            with urllib.request.urlopen(download_url, context=self.context) as resp:
+                content_length = int(resp.headers.get("Content-Length") or 0)
+                if content_length > MODELS_IN_MEMORY_LIMIT:
+                    # Very large bundle: download to a temp file
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
+                        tmp_path = tmp.name
+                        shutil.copyfileobj(resp, tmp, DOWNLOAD_CHUNK_SIZE)
+                    archive = tmp_path
+                else:
+                    buffer = io.BytesIO()
+                    shutil.copyfileobj(resp, buffer, DOWNLOAD_CHUNK_SIZE)
+                    archive = buffer.getvalue()
+
+            # Clear existing downloaded models (and their optimized copies) before extracting
+            for subdir in ("onnx", "cards", "onnx_opt"):
                 target = os.path.join(models_dir, subdir)
                 if os.path.exists(target):
                     shutil.rmtree(target)
 
             # Extract
-            with zipfile.ZipFile(tmp_path, "r") as zf:
-                zf.extractall(models_dir)
+            extract_zip_parallel(archive, models_dir)
 
             logger.info("Models installed to %s", models_dir)
             return True
@@ -110,7 +217,8 @@ class ModelUpdate:
             return False
 
         finally:
-            try:
-                os.remove(tmp_path)
-            except (OSError, UnboundLocalError):
-                pass
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
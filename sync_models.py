@@ -1,29 +1,251 @@
-"""Sync ML model files from statistical-drafting repo into models/ directory."""
+"""Sync ML model files from statistical-drafting repo into models/ directory.
 
+FP32 models are synced into models/onnx_src/. quantize() then fills
+models/onnx/ (the directory the app and installer use) with exactly one
+variant per model: the INT8 quantized copy when its ratings agree with the
+FP32 model, otherwise the FP32 model itself.
+"""
+
+import hashlib
+import json
+import random
 import shutil
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 SRC = os.path.expanduser("~/statistical-drafting/data")
 DST = os.path.join(os.path.dirname(__file__), "models")
+INT8_SUFFIX = "_int8.onnx"
+COPY_WORKERS = 8
+
+# Synced subdirectory (source, destination) pairs and their file extension
+SYNC_DIRS = (("onnx", "onnx_src", ".onnx"), ("cards", "cards", ".csv"))
+
+# INT8 models are only shipped if no sample-pool rating moves by more than this
+INT8_MAX_RATING_DELTA = 2.0
+INT8_SAMPLE_POOL_SIZES = (0, 1, 8, 15, 23, 30, 42)
+# Metadata key recording which FP32 model an INT8 model was built from
+INT8_SOURCE_HASH_KEY = "source_sha256"
+# models/onnx_src/ file mapping model name -> hash of the FP32 model whose INT8
+# build was rejected, so it is not re-quantized until the model changes
+INT8_REJECTED_FILE = "int8_rejected.json"
+
+
+def _is_up_to_date(src_path, dst_path):
+    """True if dst already has the same size and mtime as src."""
+    try:
+        src_stat = os.stat(src_path)
+        dst_stat = os.stat(dst_path)
+    except FileNotFoundError:
+        return False
+    return (
+        src_stat.st_size == dst_stat.st_size
+        and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+    )
 
 
 def sync():
-    for subdir in ("onnx", "cards"):
-        src_dir = os.path.join(SRC, subdir)
-        dst_dir = os.path.join(DST, subdir)
+    copies = []
+    for src_subdir, dst_subdir, ext in SYNC_DIRS:
+        src_dir = os.path.join(SRC, src_subdir)
+        dst_dir = os.path.join(DST, dst_subdir)
         if not os.path.isdir(src_dir):
             print(f"Source not found: {src_dir}")
             continue
         os.makedirs(dst_dir, exist_ok=True)
 
-        ext = ".onnx" if subdir == "onnx" else ".csv"
         count = 0
+        skipped = 0
         for f in os.listdir(src_dir):
             if f.endswith(ext):
-                shutil.copy2(os.path.join(src_dir, f), os.path.join(dst_dir, f))
-                count += 1
-        print(f"Synced {count} {ext} files to {dst_dir}")
+                src_path = os.path.join(src_dir, f)
+                dst_path = os.path.join(dst_dir, f)
+                if _is_up_to_date(src_path, dst_path):
+                    skipped += 1
+                else:
+                    copies.append((src_path, dst_path))
+                    count += 1
+        print(f"Syncing {count} {ext} files to {dst_dir} ({skipped} unchanged)")
+
+    # shutil.copyfile uses the platform fast-copy paths (sendfile / CopyFileEx)
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        list(executor.map(lambda paths: shutil.copyfile(*paths), copies))
+
+    # Preserve mtimes so unchanged files are skipped on the next run
+    for src_path, dst_path in copies:
+        shutil.copystat(src_path, dst_path)
+    print(f"Synced {len(copies)} files")
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as model_file:
+        for chunk in iter(lambda: model_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _int8_source_hash(int8_path):
+    """Return the FP32 model hash recorded in an INT8 model, or None."""
+    import onnx
+
+    if not os.path.exists(int8_path):
+        return None
+    model = onnx.load(int8_path, load_external_data=False)
+    for prop in model.metadata_props:
+        if prop.key == INT8_SOURCE_HASH_KEY:
+            return prop.value
+    return None
+
+
+def _sample_ratings(model_path, pools):
+    """Run the model on each sample pool and return the normalized ratings."""
+    import numpy as np
+    import onnxruntime as ort
+    from src.ml_rating import normalize_scores
+
+    session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+    input_names = [inp.name for inp in session.get_inputs()]
+    results = []
+    for pool in pools:
+        collection = np.zeros((1, len(pool)), dtype=np.float32)
+        collection[0] = pool
+        pack = np.ones_like(collection)
+        outputs = session.run(None, {input_names[0]: collection, input_names[1]: pack})
+        results.append(normalize_scores(outputs[0].flatten()))
+    return np.stack(results)
+
+
+def _sample_pools(num_cards):
+    """Deterministic card-count vectors used to compare FP32 and INT8 ratings."""
+    rng = random.Random(17)
+    pools = []
+    for size in INT8_SAMPLE_POOL_SIZES:
+        pool = [0.0] * num_cards
+        for _ in range(size):
+            pool[rng.randrange(num_cards)] += 1
+        pools.append(pool)
+    return pools
+
+
+def _model_input_size(model_path, set_code):
+    """Number of cards the model expects, from its input shape or the card CSV."""
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+    size = session.get_inputs()[0].shape[-1]
+    if isinstance(size, int):
+        return size
+    with open(os.path.join(DST, "cards", f"{set_code}.csv"), encoding="utf-8-sig") as csv_file:
+        return sum(1 for _ in csv_file) - 1
+
+
+def _build_int8(src_path, dst_path, source_hash):
+    """Quantize src_path to dst_path; return the max rating delta vs FP32."""
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        src_path,
+        dst_path,
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=["MatMul", "Gemm"],
+    )
+    model = onnx.load(dst_path)
+    onnx.helper.set_model_props(model, {INT8_SOURCE_HASH_KEY: source_hash})
+    onnx.save(model, dst_path)
+
+    set_code = os.path.basename(src_path)[: -len(".onnx")].rsplit("_", 1)[0]
+    pools = _sample_pools(_model_input_size(src_path, set_code))
+    delta = abs(_sample_ratings(src_path, pools) - _sample_ratings(dst_path, pools))
+    return float(delta.max())
+
+
+def _read_rejected(path):
+    try:
+        with open(path, encoding="utf-8") as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_rejected(path, rejected):
+    with open(path, "w", encoding="utf-8") as json_file:
+        json.dump(rejected, json_file, indent=1, sort_keys=True)
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def quantize():
+    """Fill models/onnx/ with one shipped variant per synced FP32 model.
+
+    The INT8 model is rebuilt whenever the FP32 model's content changes and is
+    only kept if its ratings agree with the FP32 model on sample pools. A
+    failed or rejected build falls back to the FP32 model and is not retried
+    until the FP32 model changes.
+    """
+    try:
+        import onnx  # noqa: F401 - required by onnxruntime.quantization
+        import onnxruntime.quantization  # noqa: F401
+        quantization_available = True
+    except ImportError:
+        print("onnxruntime.quantization not available, shipping FP32 models")
+        quantization_available = False
+
+    src_dir = os.path.join(DST, "onnx_src")
+    dst_dir = os.path.join(DST, "onnx")
+    if not os.path.isdir(src_dir):
+        return
+    os.makedirs(dst_dir, exist_ok=True)
+    rejected_path = os.path.join(src_dir, INT8_REJECTED_FILE)
+    rejected = _read_rejected(rejected_path)
+    still_rejected = {}
+
+    int8_count = 0
+    fp32_count = 0
+    for f in os.listdir(src_dir):
+        if not f.endswith(".onnx"):
+            continue
+        src_path = os.path.join(src_dir, f)
+        fp32_path = os.path.join(dst_dir, f)
+        int8_path = os.path.join(dst_dir, f[: -len(".onnx")] + INT8_SUFFIX)
+
+        use_int8 = False
+        if quantization_available:
+            source_hash = _file_sha256(src_path)
+            if rejected.get(f) == source_hash:
+                still_rejected[f] = source_hash
+            else:
+                try:
+                    if _int8_source_hash(int8_path) == source_hash:
+                        use_int8 = True
+                    else:
+                        delta = _build_int8(src_path, int8_path, source_hash)
+                        use_int8 = delta <= INT8_MAX_RATING_DELTA
+                        if not use_int8:
+                            print(f"{f}: INT8 ratings differ by up to {delta:.1f}, shipping FP32")
+                except Exception as e:
+                    print(f"{f}: INT8 quantization failed ({e}), shipping FP32")
+                if not use_int8:
+                    still_rejected[f] = source_hash
+
+        if use_int8:
+            _remove(fp32_path)
+            int8_count += 1
+        else:
+            _remove(int8_path)
+            if not _is_up_to_date(src_path, fp32_path):
+                shutil.copy2(src_path, fp32_path)
+            fp32_count += 1
+
+    if quantization_available and still_rejected != rejected:
+        _write_rejected(rejected_path, still_rejected)
+    print(f"Prepared {int8_count} INT8 and {fp32_count} FP32 models in {dst_dir}")
 
 
 if __name__ == "__main__":
     sync()
+    quantize()
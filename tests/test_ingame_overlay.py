@@ -0,0 +1,218 @@
+import pytest
+from unittest.mock import MagicMock
+from src import ingame_overlay
+from src.ingame_overlay import InGameOverlay, mtga_draft_sort_key, precompute_mtga_sort_key
+from src.configuration import Configuration
+
+SORT_KEY_CASES = [
+    # Unknown card: name is a numeric Arena ID
+    ({"name": "87654"}, (3, 1, 32, "87654")),
+    ({"name": "Grand Abolisher", "rarity": "mythic", "types": ["Creature"], "colors": ["W"]},
+     (0, 0, 0, "Grand Abolisher")),
+    ({"name": "Gold Card", "rarity": "uncommon", "types": ["Creature"], "colors": ["U", "R"]},
+     (2, 0, 8, "Gold Card")),
+    ({"name": "Colorless Card", "rarity": "common", "types": ["Creature"], "colors": []},
+     (3, 0, 31, "Colorless Card")),
+    # Artifacts and lands sort by color identity when it is available
+    ({"name": "Signet", "rarity": "common", "types": ["Artifact"], "colors": [],
+      "color_identity": ["B", "G"]},
+     (3, 0, 10, "Signet")),
+    ({"name": "Dual Land", "rarity": "rare", "types": ["Land"], "colors": [],
+      "color_identity": ["W", "U"]},
+     (1, 1, 5, "Dual Land")),
+    ({"name": "Plain Land", "rarity": "common", "types": ["Land"], "colors": []},
+     (3, 1, 31, "Plain Land")),
+]
+
+
+@pytest.mark.parametrize("card, expected", SORT_KEY_CASES)
+def test_mtga_draft_sort_key_cached(card, expected):
+    uncached = precompute_mtga_sort_key(dict(card))
+
+    card = dict(card)
+    first = mtga_draft_sort_key(card)
+    cached = mtga_draft_sort_key(card)
+
+    assert uncached == expected
+    assert first == expected
+    assert cached == expected
+    assert card[ingame_overlay._SORT_KEY_FIELD] == expected
+
+
+def test_mtga_draft_sort_key_order():
+    cards = [dict(card) for card, _ in SORT_KEY_CASES]
+    order = [card["name"] for card in sorted(cards, key=mtga_draft_sort_key)]
+    assert order == [
+        "Grand Abolisher",
+        "Dual Land",
+        "Gold Card",
+        "Signet",
+        "Colorless Card",
+        "Plain Land",
+        "87654",
+    ]
+
+
+@pytest.fixture(name="overlay")
+def fixture_overlay(monkeypatch):
+    """InGameOverlay with fake badges and a fake MTGA window."""
+    monkeypatch.setattr(InGameOverlay, "_create_badges", lambda self: None)
+    monkeypatch.setattr(InGameOverlay, "_start_polling", lambda self: None)
+    overlay = InGameOverlay(MagicMock(), Configuration())
+    overlay._badges = [MagicMock() for _ in range(ingame_overlay.MAX_PACK_SIZE)]
+
+    overlay.window_rect = (0, 0, 1920, 1080)
+    monkeypatch.setattr(overlay, "_find_mtga_window", lambda: 1)
+    monkeypatch.setattr(overlay, "_is_minimized", lambda hwnd: False)
+    monkeypatch.setattr(overlay, "_get_mtga_rect", lambda hwnd: overlay.window_rect)
+    return overlay
+
+
+def _set_pack(overlay, pack_cards, ratings, pick_number):
+    overlay._sorted_pack_cards = sorted(pack_cards, key=mtga_draft_sort_key)
+    overlay._last_pack_cards = pack_cards
+    overlay._last_ratings = ratings
+    overlay._last_pick_number = pick_number
+
+
+def test_get_card_ratings_cached(overlay):
+    pack = [{"name": "Card A"}, {"name": "Card B"}]
+    ratings = {"Card A": 60.0, "Card B": 70.0}
+
+    card_ratings, best = overlay._get_card_ratings(pack, ratings)
+    assert card_ratings == [("Card A", 60.0), ("Card B", 70.0)]
+    assert best == 70.0
+    assert overlay._get_card_ratings(pack, ratings)[0] is card_ratings
+
+
+def test_get_card_ratings_invalidated(overlay):
+    pack = [{"name": "Card A"}, {"name": "Card B"}]
+    ratings = {"Card A": 60.0, "Card B": 70.0}
+    overlay._get_card_ratings(pack, ratings)
+
+    # New ratings dict for the same pack
+    new_ratings = {"Card A": 80.0, "Card B": 70.0}
+    card_ratings, best = overlay._get_card_ratings(pack, new_ratings)
+    assert card_ratings == [("Card A", 80.0), ("Card B", 70.0)]
+    assert best == 80.0
+
+    # New pack list with the same ratings dict
+    new_pack = [{"name": "Card B"}]
+    card_ratings, best = overlay._get_card_ratings(new_pack, new_ratings)
+    assert card_ratings == [("Card B", 70.0)]
+    assert best == 70.0
+
+
+def test_get_card_ratings_cleared_by_hide_all(overlay):
+    pack = [{"name": "Card A"}]
+    ratings = {"Card A": 60.0}
+    overlay._get_card_ratings(pack, ratings)
+
+    overlay.hide_all()
+
+    assert overlay._cached_rating_inputs is None
+
+
+def test_position_badges_skips_unchanged_state(overlay):
+    pack = [{"name": "Card A"}, {"name": "Card B"}]
+    ratings = {"Card A": 60.0, "Card B": 70.0}
+    _set_pack(overlay, pack, ratings, 1)
+
+    assert overlay._position_badges() is True
+    assert overlay._badges[0].show.call_count == 1
+    assert overlay._position_badges() is False
+    assert overlay._badges[0].show.call_count == 1
+
+
+@pytest.mark.parametrize("change", ["rect", "ratings", "pack", "pick"])
+def test_position_badges_redraws_on_change(overlay, change):
+    pack = [{"name": "Card A"}, {"name": "Card B"}]
+    ratings = {"Card A": 60.0, "Card B": 70.0}
+    _set_pack(overlay, pack, ratings, 1)
+    assert overlay._position_badges() is True
+
+    if change == "rect":
+        overlay.window_rect = (100, 100, 2020, 1180)
+    elif change == "ratings":
+        _set_pack(overlay, pack, {"Card A": 90.0, "Card B": 70.0}, 1)
+    elif change == "pack":
+        _set_pack(overlay, [{"name": "Card B"}], ratings, 1)
+    else:
+        _set_pack(overlay, pack, ratings, 2)
+
+    assert overlay._position_badges() is True
+
+
+def test_position_badges_redraws_after_hide(overlay):
+    pack = [{"name": "Card A"}]
+    ratings = {"Card A": 60.0}
+    _set_pack(overlay, pack, ratings, 1)
+    assert overlay._position_badges() is True
+
+    overlay._hide_all()
+
+    assert overlay._position_badges() is True
+
+
+def test_create_badges_prepares_click_through_offscreen(monkeypatch):
+    calls = []
+
+    class FakeBadge:
+        def __init__(self, root):
+            self.top = MagicMock()
+            self.top.withdraw.side_effect = lambda: calls.append("withdraw")
+
+        def map_offscreen(self):
+            calls.append("map")
+
+        def _apply_click_through(self):
+            calls.append("click_through")
+
+    root = MagicMock()
+    root.update_idletasks.side_effect = lambda: calls.append("flush")
+    monkeypatch.setattr(ingame_overlay.sys, "platform", "win32")
+    monkeypatch.setattr(ingame_overlay, "RatingBadge", FakeBadge)
+    monkeypatch.setattr(InGameOverlay, "_start_polling", lambda self: None)
+
+    overlay = InGameOverlay(root, Configuration())
+
+    size = ingame_overlay.MAX_PACK_SIZE
+    assert len(overlay._badges) == size
+    assert calls == ["map"] * size + ["flush"] + ["click_through"] * size + ["withdraw"] * size
+
+
+@pytest.mark.parametrize("event, id_child, expected", [
+    (ingame_overlay.EVENT_OBJECT_LOCATIONCHANGE, 0, "_on_mtga_moved"),
+    (ingame_overlay.EVENT_OBJECT_DESTROY, 0, "_on_mtga_closed"),
+    (ingame_overlay.EVENT_OBJECT_HIDE, 0, "_on_mtga_closed"),
+    # EVENT_OBJECT_SHOW is delivered by the close hook's range but ignored
+    (0x8002, 0, None),
+    # Events for child elements of the window are ignored
+    (ingame_overlay.EVENT_OBJECT_LOCATIONCHANGE, 3, None),
+    (ingame_overlay.EVENT_OBJECT_DESTROY, 3, None),
+])
+def test_on_win_event_dispatch(overlay, event, id_child, expected):
+    overlay._mtga_hwnd = 1
+    overlay.root.after.reset_mock()
+
+    overlay._on_win_event(None, event, 1, ingame_overlay.OBJID_WINDOW, id_child, 0, 0)
+
+    if expected is None:
+        overlay.root.after.assert_not_called()
+    else:
+        overlay.root.after.assert_called_once_with(0, getattr(overlay, expected))
+
+
+def test_on_mtga_closed_hides_badges(overlay):
+    pack = [{"name": "Card A"}]
+    _set_pack(overlay, pack, {"Card A": 60.0}, 1)
+    overlay._position_badges()
+    overlay._mtga_hwnd = 1
+    overlay._poll_interval = ingame_overlay.POLL_INTERVAL_MAX_MS
+
+    overlay._on_mtga_closed()
+
+    assert overlay._mtga_hwnd is None
+    overlay._badges[0].hide.assert_called_once()
+    assert overlay._poll_interval == ingame_overlay.POLL_INTERVAL_MS
+    overlay.root.after.assert_called_with(ingame_overlay.POLL_INTERVAL_MS, overlay._poll_tick)
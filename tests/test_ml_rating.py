@@ -0,0 +1,175 @@
+import os
+import shutil
+import pytest
+from src.ml_rating import MLModelManager, MLRatingCalculator, is_ml_rating_available
+
+np = pytest.importorskip("numpy")
+
+pytestmark = pytest.mark.skipif(not is_ml_rating_available(), reason="onnxruntime not installed")
+
+TEST_SET = "TST"
+TEST_CARDNAMES = ["Card A", "Card B", "Card C", "Card D", "Card E"]
+TEST_MODEL = os.path.join(os.path.dirname(__file__), "data", f"{TEST_SET}_Premier.onnx")
+
+
+def _model_weights():
+    """Weights baked into tests/data/TST_Premier.onnx.
+
+    The model is a tiny linear graph: scores = (collection @ W + B) * pack
+    """
+    num_cards = len(TEST_CARDNAMES)
+    rows, cols = np.indices((num_cards, num_cards))
+    weights = (((rows * 7 + cols * 3) % 11) - 5).astype(np.float32) / 5
+    bias = (np.arange(num_cards, dtype=np.float32) - 2) / 4
+    return weights, bias
+
+
+def _expected_ratings(weights, bias, pool_names):
+    collection = np.zeros(len(TEST_CARDNAMES), dtype=np.float32)
+    for name in pool_names:
+        if name in TEST_CARDNAMES:
+            collection[TEST_CARDNAMES.index(name)] += 1
+    raw = collection @ weights + bias
+    ratings = 100 / (1 + np.exp(-1.2 * (raw - raw.mean()) / raw.std()))
+    return {name: round(float(r), 1) for name, r in zip(TEST_CARDNAMES, ratings)}
+
+
+@pytest.fixture
+def model_directory(tmp_path):
+    os.makedirs(tmp_path / "onnx")
+    os.makedirs(tmp_path / "cards")
+    shutil.copyfile(TEST_MODEL, tmp_path / "onnx" / f"{TEST_SET}_Premier.onnx")
+    weights, bias = _model_weights()
+    with open(tmp_path / "cards" / f"{TEST_SET}.csv", "w", encoding="utf-8") as csv_file:
+        csv_file.write("name\n" + "\n".join(TEST_CARDNAMES) + "\n")
+    return str(tmp_path), weights, bias
+
+
+def test_get_cardnames(model_directory):
+    directory, _, _ = model_directory
+    manager = MLModelManager(directory)
+    assert manager.get_cardnames(TEST_SET) == TEST_CARDNAMES
+    assert manager.get_name_to_index(TEST_SET) == {
+        name: i for i, name in enumerate(TEST_CARDNAMES)
+    }
+
+
+def test_get_cardnames_missing_set(model_directory):
+    directory, _, _ = model_directory
+    manager = MLModelManager(directory)
+    assert manager.get_cardnames("XXX") is None
+    assert manager.get_name_to_index("XXX") is None
+
+
+def test_compute_ratings(model_directory):
+    directory, weights, bias = model_directory
+    calculator = MLRatingCalculator(MLModelManager(directory))
+    pool = ["Card A", "Card C", "Card C", "Unknown Card"]
+
+    ratings = calculator.compute_ratings(pool, TEST_SET)
+
+    assert ratings == pytest.approx(_expected_ratings(weights, bias, pool), abs=0.11)
+    assert calculator.has_ratings()
+    assert calculator.get_rating("Card B") == ratings["Card B"]
+
+
+def test_compute_ratings_consecutive_picks(model_directory):
+    directory, weights, bias = model_directory
+    calculator = MLRatingCalculator(MLModelManager(directory))
+    pools = [[], ["Card A"], ["Card A", "Card E"], ["Card B"], ["Card B", "Card B"]]
+
+    for pool in pools:
+        ratings = calculator.compute_ratings(pool, TEST_SET)
+        assert ratings == pytest.approx(_expected_ratings(weights, bias, pool), abs=0.11)
+
+
+def test_compute_ratings_missing_model(model_directory):
+    directory, _, _ = model_directory
+    calculator = MLRatingCalculator(MLModelManager(directory))
+    assert calculator.compute_ratings(["Card A"], "XXX") == {}
+    assert not calculator.has_ratings()
+
+
+def test_compute_ratings_after_model_directory_change(model_directory):
+    directory, weights, bias = model_directory
+    manager = MLModelManager(directory)
+    calculator = MLRatingCalculator(manager)
+    calculator.compute_ratings(["Card A", "Card D"], TEST_SET)
+
+    manager.set_model_directory(directory)
+    pool = ["Card B"]
+    ratings = calculator.compute_ratings(pool, TEST_SET)
+
+    assert ratings == pytest.approx(_expected_ratings(weights, bias, pool), abs=0.11)
+
+
+def _optimized_models(directory):
+    return sorted(os.listdir(os.path.join(directory, "onnx_opt")))
+
+
+def test_optimized_model_reused(model_directory):
+    directory, weights, bias = model_directory
+    pool = ["Card C", "Card D"]
+    expected = _expected_ratings(weights, bias, pool)
+
+    ratings = MLRatingCalculator(MLModelManager(directory)).compute_ratings(pool, TEST_SET)
+    optimized = _optimized_models(directory)
+    assert len(optimized) == 1 and optimized[0].startswith(f"{TEST_SET}_Premier.")
+    assert ratings == pytest.approx(expected, abs=0.11)
+
+    # A new manager loads the optimized copy saved by the first one
+    ratings = MLRatingCalculator(MLModelManager(directory)).compute_ratings(pool, TEST_SET)
+    assert _optimized_models(directory) == optimized
+    assert ratings == pytest.approx(expected, abs=0.11)
+
+
+def test_optimized_model_replaced_with_older_model(model_directory, tmp_path):
+    directory, weights, bias = model_directory
+    pool = ["Card C", "Card D"]
+    model_path = os.path.join(directory, "onnx", f"{TEST_SET}_Premier.onnx")
+    MLRatingCalculator(MLModelManager(directory)).compute_ratings(pool, TEST_SET)
+    old_optimized = _optimized_models(directory)
+
+    # Swap in a "retrained" model (bias on Card D changed) with an older mtime
+    bias_bytes = bias.tobytes()
+    new_bias = bias.copy()
+    new_bias[3] = 5.0
+    with open(model_path, "rb") as model_file:
+        model_bytes = model_file.read()
+    assert model_bytes.count(bias_bytes) == 1
+    model_stat = os.stat(model_path)
+    with open(model_path, "wb") as model_file:
+        model_file.write(model_bytes.replace(bias_bytes, new_bias.tobytes()))
+    os.utime(model_path, ns=(model_stat.st_atime_ns, model_stat.st_mtime_ns - 10**9))
+
+    ratings = MLRatingCalculator(MLModelManager(directory)).compute_ratings(pool, TEST_SET)
+
+    assert ratings == pytest.approx(_expected_ratings(weights, new_bias, pool), abs=0.11)
+    new_optimized = _optimized_models(directory)
+    assert len(new_optimized) == 1 and new_optimized != old_optimized
+
+
+def test_onnxruntime_import_failure_cached(monkeypatch, model_directory):
+    import builtins
+    from src import ml_rating
+
+    directory, _, _ = model_directory
+    monkeypatch.setattr(ml_rating, "_ort", None)
+    monkeypatch.setattr(ml_rating, "_ort_import_failed", False)
+    real_import = builtins.__import__
+    attempts = []
+
+    def failing_import(name, *args, **kwargs):
+        if name == "onnxruntime":
+            attempts.append(name)
+            raise ImportError("DLL load failed")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", failing_import)
+
+    assert not is_ml_rating_available()
+    calculator = MLRatingCalculator(MLModelManager(directory))
+    assert calculator.compute_ratings(["Card A"], TEST_SET) == {}
+    assert calculator.compute_ratings(["Card A"], TEST_SET) == {}
+    assert not is_ml_rating_available()
+    assert attempts == ["onnxruntime"]
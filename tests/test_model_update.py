@@ -0,0 +1,143 @@
+import json
+import os
+import pathlib
+import urllib.error
+import zipfile
+import pytest
+from src import model_update
+from src.model_update import ModelUpdate, extract_zip_parallel
+
+MODEL_FILES = {
+    "onnx/TST_Premier.onnx": b"\x08\x07" * 1024,
+    "cards/TST.csv": b"name\nCard A\nCard B\n",
+}
+
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "models"
+    directory.mkdir()
+    monkeypatch.setattr(model_update, "get_appdata_models_dir", lambda: str(directory))
+    return directory
+
+
+@pytest.fixture
+def bundle_url(tmp_path):
+    bundle_path = tmp_path / "models.zip"
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in MODEL_FILES.items():
+            zf.writestr(name, data)
+    return pathlib.Path(bundle_path).as_uri()
+
+
+def _assert_installed(models_dir):
+    for name, data in MODEL_FILES.items():
+        assert (models_dir / name).read_bytes() == data
+
+
+def test_download_and_install_success(models_dir, bundle_url):
+    stale_model = models_dir / "onnx" / "OLD_Premier.onnx"
+    stale_model.parent.mkdir()
+    stale_model.write_bytes(b"stale")
+
+    assert ModelUpdate().download_and_install(bundle_url)
+
+    _assert_installed(models_dir)
+    assert not stale_model.exists()
+
+
+def test_download_and_install_large_bundle(models_dir, bundle_url, monkeypatch):
+    monkeypatch.setattr(model_update, "MODELS_IN_MEMORY_LIMIT", 0)
+
+    assert ModelUpdate().download_and_install(bundle_url)
+
+    _assert_installed(models_dir)
+
+
+def test_download_and_install_failure(models_dir, tmp_path):
+    missing_url = pathlib.Path(tmp_path / "missing.zip").as_uri()
+
+    assert not ModelUpdate().download_and_install(missing_url)
+    assert os.listdir(models_dir) == []
+
+
+def test_extract_zip_parallel(tmp_path):
+    files = {f"onnx/SET{i}_Premier.onnx": bytes([i]) * (i * 512) for i in range(20)}
+    files.update({f"cards/nested/SET{i}.csv": f"name\nCard {i}\n".encode() for i in range(20)})
+    bundle_path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    target = tmp_path / "out"
+    target.mkdir()
+
+    extract_zip_parallel(bundle_path.read_bytes(), str(target))
+
+    for name, data in files.items():
+        assert (target / name).read_bytes() == data
+
+
+class MockReleaseResponse:
+    def __init__(self, release, etag):
+        self.body = json.dumps(release).encode()
+        self.headers = {"ETag": etag}
+
+    def read(self):
+        return self.body
+
+
+@pytest.fixture
+def release_server(monkeypatch):
+    """Serve a fixed release JSON, answering 304 when the ETag matches."""
+    server = {
+        "release": {
+            "tag_name": "models-2026-02-19",
+            "assets": [
+                {"name": "models.zip", "browser_download_url": "https://example.com/models.zip"}
+            ],
+        },
+        "etag": '"abc123"',
+        "requests": [],
+    }
+
+    def mock_urlopen(request, context=None):
+        if_none_match = request.get_header("If-none-match")
+        server["requests"].append(if_none_match)
+        if if_none_match == server["etag"]:
+            raise urllib.error.HTTPError(request.full_url, 304, "Not Modified", {}, None)
+        return MockReleaseResponse(server["release"], server["etag"])
+
+    monkeypatch.setattr(model_update.urllib.request, "urlopen", mock_urlopen)
+    return server
+
+
+def test_check_for_update_available(models_dir, release_server):
+    update = ModelUpdate()
+
+    expected = ("models-2026-02-19", "https://example.com/models.zip")
+    assert update.check_for_update("models-2026-01-01") == expected
+    # The second check is conditional and answered from the cache
+    assert update.check_for_update("models-2026-01-01") == expected
+    assert release_server["requests"] == [None, '"abc123"']
+
+
+def test_check_for_update_not_modified(models_dir, release_server):
+    update = ModelUpdate()
+
+    assert update.check_for_update("models-2026-02-19") is None
+    assert update.check_for_update("models-2026-02-19") is None
+    assert release_server["requests"] == [None, '"abc123"']
+
+
+def test_check_for_update_release_changed(models_dir, release_server):
+    update = ModelUpdate()
+    assert update.check_for_update("models-2026-02-19") is None
+
+    release_server["release"]["tag_name"] = "models-2026-03-01"
+    release_server["etag"] = '"def456"'
+
+    assert update.check_for_update("models-2026-02-19") == (
+        "models-2026-03-01",
+        "https://example.com/models.zip",
+    )
+    assert release_server["requests"] == [None, '"abc123"']
@@ -0,0 +1,91 @@
+import os
+import shutil
+import pytest
+import sync_models
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+TEST_MODEL = os.path.join(os.path.dirname(__file__), "data", "TST_Premier.onnx")
+
+
+@pytest.fixture
+def model_dirs(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    dst = tmp_path / "models"
+    os.makedirs(src / "onnx")
+    os.makedirs(src / "cards")
+    shutil.copyfile(TEST_MODEL, src / "onnx" / "TST_Premier.onnx")
+    (src / "cards" / "TST.csv").write_text("name\nA\nB\nC\nD\nE\n", encoding="utf-8")
+    monkeypatch.setattr(sync_models, "SRC", str(src))
+    monkeypatch.setattr(sync_models, "DST", str(dst))
+    return src, dst
+
+
+def test_sync_and_quantize_ships_int8(model_dirs):
+    _, dst = model_dirs
+
+    sync_models.sync()
+    sync_models.quantize()
+
+    assert os.listdir(dst / "onnx_src") == ["TST_Premier.onnx"]
+    assert os.listdir(dst / "onnx") == ["TST_Premier_int8.onnx"]
+    int8_path = str(dst / "onnx" / "TST_Premier_int8.onnx")
+    assert sync_models._int8_source_hash(int8_path) == sync_models._file_sha256(TEST_MODEL)
+
+
+def test_quantize_falls_back_to_fp32_on_disagreement(model_dirs, monkeypatch):
+    _, dst = model_dirs
+    monkeypatch.setattr(sync_models, "INT8_MAX_RATING_DELTA", -1.0)
+
+    sync_models.sync()
+    sync_models.quantize()
+
+    assert os.listdir(dst / "onnx") == ["TST_Premier.onnx"]
+
+
+def test_quantize_rebuilds_when_source_content_changes(model_dirs, monkeypatch):
+    src, dst = model_dirs
+    sync_models.sync()
+    sync_models.quantize()
+
+    # Replace the source with different content but an older mtime
+    src_model = src / "onnx" / "TST_Premier.onnx"
+    old_stat = os.stat(src_model)
+    src_model.write_bytes(src_model.read_bytes().replace(b"test_model", b"test_modeX"))
+    os.utime(src_model, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns - 10**9))
+    monkeypatch.setattr(sync_models, "INT8_MAX_RATING_DELTA", -1.0)
+
+    sync_models.sync()
+    sync_models.quantize()
+
+    assert os.listdir(dst / "onnx") == ["TST_Premier.onnx"]
+
+
+def test_quantize_falls_back_to_fp32_on_build_failure(model_dirs, monkeypatch):
+    _, dst = model_dirs
+
+    def failing_build(src_path, dst_path, source_hash):
+        open(dst_path, "wb").close()  # partial output
+        raise RuntimeError("unsupported op")
+
+    monkeypatch.setattr(sync_models, "_build_int8", failing_build)
+
+    sync_models.sync()
+    sync_models.quantize()
+
+    assert os.listdir(dst / "onnx") == ["TST_Premier.onnx"]
+
+
+def test_quantize_does_not_retry_rejected_model(model_dirs, monkeypatch):
+    _, dst = model_dirs
+    monkeypatch.setattr(sync_models, "INT8_MAX_RATING_DELTA", -1.0)
+    sync_models.sync()
+    sync_models.quantize()
+
+    builds = []
+    monkeypatch.setattr(sync_models, "_build_int8", lambda *args: builds.append(args))
+    sync_models.quantize()
+
+    assert builds == []
+    assert os.listdir(dst / "onnx") == ["TST_Premier.onnx"]